@@ -19,87 +19,243 @@ Options
 # pylint: enable=line-too-long
 import os
 import configparser
+import functools
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Tuple
 import gitlab
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 from docopt import docopt
 from fg_migration import fg_print
+from fg_migration.workers import map_bounded
 
 #######################
 # CONFIG SECTION START
 #######################
-if not os.path.exists(".migrate.ini"):
-    fg_print.error("Please create .migrate.ini as explained in the README!")
-    os.sys.exit()
-
-config = configparser.RawConfigParser()
-config.read(".migrate.ini")
-GITLAB_URL = config.get("migrate", "gitlab_url")
-GITLAB_TOKEN = config.get("migrate", "gitlab_token")
-GITLAB_ADMIN_USER = config.get("migrate", "gitlab_admin_user")
-GITLAB_ADMIN_PASS = config.get("migrate", "gitlab_admin_pass")
-FORGEJO_URL = config.get("migrate", "forgejo_url")
-FORGEJO_API_URL = f"{FORGEJO_URL}/api/v1"
-FORGEJO_HOST = FORGEJO_URL.split("/")[-1]
-FORGEJO_USER = config.get("migrate", "forgejo_admin_user")
-FORGEJO_PASSWORD = config.get("migrate", "forgejo_admin_pass")
-FORGEJO_TOKEN = config.get("migrate", "forgejo_token")
-FORGEJO_PREFIX_URL = f"https://{FORGEJO_USER}:{FORGEJO_PASSWORD}@{FORGEJO_HOST}"
+# number of projects handled concurrently against the Forgejo API
+MAX_WORKERS = 20
+# (connect, read) timeout in seconds for every Forgejo API call
+FORGEJO_TIMEOUT = (3.05, 10)
+# console output is written out once per batch of projects
+FLUSH_EVERY = 100
+# projects submitted to the worker pool ahead of the finished ones
+SUBMIT_WINDOW = 2 * MAX_WORKERS
+
+
+@dataclass(frozen=True, slots=True)
+class MigrateConfig:
+    """Settings read from .migrate.ini"""
+
+    gitlab_url: str
+    gitlab_token: str
+    gitlab_admin_user: str
+    gitlab_admin_pass: str
+    forgejo_url: str
+    forgejo_api_url: str
+    # %-template of the push mirror API url, filled with the project path
+    forgejo_mirrors_url: str
+    forgejo_user: str
+    forgejo_password: str
+    forgejo_token: str
+    forgejo_prefix_url: str
+
+
+@functools.lru_cache(maxsize=1)
+def load_config() -> MigrateConfig:
+    """Read .migrate.ini once and return its settings"""
+    if not os.path.exists(".migrate.ini"):
+        fg_print.error("Please create .migrate.ini as explained in the README!")
+        os.sys.exit()
+
+    config = configparser.RawConfigParser()
+    config.read(".migrate.ini")
+    section = config["migrate"]
+    forgejo_url = section["forgejo_url"]
+    forgejo_host = forgejo_url.split("/")[-1]
+    forgejo_user = section["forgejo_admin_user"]
+    forgejo_password = section["forgejo_admin_pass"]
+    return MigrateConfig(
+        gitlab_url=section["gitlab_url"],
+        gitlab_token=section["gitlab_token"],
+        gitlab_admin_user=section["gitlab_admin_user"],
+        gitlab_admin_pass=section["gitlab_admin_pass"],
+        forgejo_url=forgejo_url,
+        forgejo_api_url=f"{forgejo_url}/api/v1",
+        forgejo_mirrors_url=f"{forgejo_url}/api/v1/repos/%s/push_mirrors",
+        forgejo_user=forgejo_user,
+        forgejo_password=forgejo_password,
+        forgejo_token=section["forgejo_token"],
+        forgejo_prefix_url=f"https://{forgejo_user}:{forgejo_password}@{forgejo_host}",
+    )
+
+
 #######################
 # CONFIG SECTION END
 #######################
 
 
-def delete_to_forgejo(gitlab_projects: list) -> None:
+@functools.lru_cache(maxsize=1)
+def forgejo_session() -> requests.Session:
+    """Return the keep-alive session shared by all Forgejo API calls
+
+    Its connection pool is large enough for every worker thread and blocks
+    instead of opening throwaway connections, so each worker keeps reusing
+    one of at most MAX_WORKERS keep-alive sockets.
+    """
+    cfg = load_config()
+    session = requests.Session()
+    session.auth = (cfg.forgejo_user, cfg.forgejo_password)
+    session.mount(
+        cfg.forgejo_url,
+        HTTPAdapter(
+            pool_connections=MAX_WORKERS,
+            pool_maxsize=MAX_WORKERS,
+            pool_block=True,
+            max_retries=Retry(
+                total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]
+            ),
+        ),
+    )
+    return session
+
+
+def list_projects(gl: gitlab.Gitlab, limit: int) -> Iterator:
+    """Stream up to limit Gitlab projects, one page of 100 at a time"""
+    return itertools.islice(gl.projects.list(iterator=True, per_page=100), limit)
+
+
+def _without_credentials(url: str) -> str:
+    """Strips the user:password part of a url, Gitlab masks it in mirror urls"""
+    parts = urlsplit(url)
+    return parts._replace(netloc=parts.netloc.rpartition("@")[2]).geturl()
+
+
+def delete_to_forgejo(gitlab_projects: Iterable) -> None:
     """Delete push mirrors from Gitlab to Forgejo"""
     fg_print.info("\nDeleting push mirrors from Gitlab")
-    for project in gitlab_projects:
-        print(f"Project: {project.name_with_namespace}")
-        proj_path = project.path_with_namespace
-        if project.remote_mirrors.list():
-            # fg_print.info(f"Push mirrors found on Gitlab for {proj_path}")
-            for mirror in project.remote_mirrors.list():
-                try:
-                    project.remote_mirrors.delete(mirror.id)
-                except Exception as err:  # pylint: disable=broad-except
-                    fg_print.error(
-                        f"Error deleting push mirror on Gitlab for {proj_path}: {err}"
-                    )
-                else:
-                    fg_print.info(f"Push mirrors deleted on Gitlab for {proj_path}")
-
-
-def delete_to_gitlab(gitlab_projects: list) -> None:
-    """Delete push mirrors from Forgejo to Gitlab"""
-    fg_print.info("\nDeleting push mirrors from Forgejo")
-    session = requests.Session()
-    session.auth = (FORGEJO_USER, FORGEJO_PASSWORD)
-    for project in gitlab_projects:
-        print(f"Project: {project.name_with_namespace}")
+    for count, project in enumerate(gitlab_projects, start=1):
+        if count % FLUSH_EVERY == 0:
+            fg_print.PRINTER.flush()
+        fg_print.log(f"Project: {project.name_with_namespace}")
         proj_path = project.path_with_namespace
-        forgejo_mirror_url = f"{FORGEJO_API_URL}/repos/{proj_path}/push_mirrors"
-        mirrors = session.get(forgejo_mirror_url).json()
+        mirrors = project.remote_mirrors.list(all=True)
+        if not mirrors:
+            continue
+        # fg_print.info(f"Push mirrors found on Gitlab for {proj_path}")
         for mirror in mirrors:
-            mirror_name = mirror["remote_name"]
-            # fg_print.info(f"Push mirrors {mirror_name} found on Gitlab for {proj_path}")
-            url = f"{forgejo_mirror_url}/{mirror_name}"
-            response: requests.Response = session.delete(url, timeout=10)
-            if response.ok:
-                fg_print.info(
-                    f"Push mirror {mirror_name} deleted on Forgejo for {proj_path}"
-                )
-            else:
+            try:
+                project.remote_mirrors.delete(mirror.id)
+            except Exception as err:  # pylint: disable=broad-except
                 fg_print.error(
-                    f"Error deleting push mirror {mirror_name} on Forgejo for {proj_path}"
+                    f"Error deleting push mirror on Gitlab for {proj_path}: {err}"
                 )
+            else:
+                fg_print.info(f"Push mirrors deleted on Gitlab for {proj_path}")
+    fg_print.PRINTER.flush()
+
+
+def _get_forgejo_mirrors(proj_path: str) -> List[Dict]:
+    """Returns the Forgejo push mirrors of a project
+
+    Raises requests.RequestException on a failed request and orjson.JSONDecodeError
+    on a body that is not JSON, like the HTML page of a proxy.
+    """
+    response: requests.Response = forgejo_session().get(
+        load_config().forgejo_mirrors_url % proj_path, timeout=FORGEJO_TIMEOUT
+    )
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
 
+def _list_forgejo_mirrors(project) -> Tuple[str, List[str]]:
+    """Returns the path and the Forgejo push mirror names of a project"""
+    fg_print.log(f"Project: {project.name_with_namespace}")
+    proj_path = project.path_with_namespace
+    try:
+        mirrors = _get_forgejo_mirrors(proj_path)
+    except (requests.RequestException, orjson.JSONDecodeError) as err:
+        fg_print.error(f"Error loading push mirrors on Forgejo for {proj_path}: {err}")
+        return proj_path, []
 
-def to_forgejo(gitlab_projects: list) -> None:
+    # fg_print.info(f"Push mirrors found on Forgejo for {proj_path}")
+    return proj_path, [mirror["remote_name"] for mirror in mirrors]
+
+
+def _delete_forgejo_mirror(proj_path: str, mirror_name: str) -> None:
+    """Delete a single push mirror from Forgejo"""
+    url = "/".join((load_config().forgejo_mirrors_url % proj_path, mirror_name))
+    try:
+        response: requests.Response = forgejo_session().delete(
+            url, timeout=FORGEJO_TIMEOUT
+        )
+    except requests.RequestException as err:
+        fg_print.error(
+            f"Error deleting push mirror {mirror_name} on Forgejo for {proj_path}: {err}"
+        )
+        return
+    if response.ok:
+        fg_print.info(f"Push mirror {mirror_name} deleted on Forgejo for {proj_path}")
+    else:
+        fg_print.error(
+            f"Error deleting push mirror {mirror_name} on Forgejo for {proj_path}: "
+            + f"{response.status_code} {response.reason}"
+        )
+
+
+def _delete_forgejo_mirrors(project) -> None:
+    """Delete all Forgejo push mirrors of a single project"""
+    proj_path, mirror_names = _list_forgejo_mirrors(project)
+    for mirror_name in mirror_names:
+        _delete_forgejo_mirror(proj_path, mirror_name)
+
+
+def delete_to_gitlab(gitlab_projects: Iterable) -> None:
+    """Delete push mirrors from Forgejo to Gitlab"""
+    fg_print.info("\nDeleting push mirrors from Forgejo")
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        # every worker lists and deletes the mirrors of one project, so listings of
+        # some projects overlap with deletions of others
+        results = map_bounded(
+            executor, _delete_forgejo_mirrors, gitlab_projects, SUBMIT_WINDOW
+        )
+        for count, _ in enumerate(results, start=1):
+            if count % FLUSH_EVERY == 0:
+                fg_print.PRINTER.flush()
+    fg_print.PRINTER.flush()
+
+
+def to_forgejo(gitlab_projects: Iterable) -> None:
     """Create push mirrors from Gitlab to Forgejo"""
     fg_print.info("\nMirroring repositories from Gitlab to Forgejo")
-    for project in gitlab_projects:
-        print(f"Project: {project.name_with_namespace}")
+    git_url_tmpl = load_config().forgejo_prefix_url + "/%s.git"
+    for count, project in enumerate(gitlab_projects, start=1):
+        if count % FLUSH_EVERY == 0:
+            fg_print.PRINTER.flush()
+        fg_print.log(f"Project: {project.name_with_namespace}")
         proj_path = project.path_with_namespace
-        proj_url = f"{FORGEJO_PREFIX_URL}/{proj_path}.git"
+        proj_url = git_url_tmpl % proj_path
+        try:
+            existing = {
+                _without_credentials(m.url)
+                for m in project.remote_mirrors.list(all=True)
+            }
+        except Exception as err:  # pylint: disable=broad-except
+            fg_print.error(
+                f"Error loading push mirrors on Gitlab for {proj_path}: {err}"
+            )
+            continue
+        if _without_credentials(proj_url) in existing:
+            fg_print.info(f"Skip {proj_path} (already mirrored)")
+            continue
         try:
             project.remote_mirrors.create({"url": proj_url, "enabled": True})
         except Exception as err:  # pylint: disable=broad-except
@@ -108,69 +264,95 @@ def to_forgejo(gitlab_projects: list) -> None:
             )
         else:
             fg_print.info(f"Push mirror created on Gitlab for {proj_path}")
+    fg_print.PRINTER.flush()
 
 
-def to_gitlab(gitlab_projects: list) -> None:
-    """Create push mirrors from Forgejo to Gitlab"""
-    fg_print.info("\nMirroring repositories from Forgejo to Gitlab")
+def _to_gitlab_one(base_post_data: dict, project) -> None:
+    """Create the push mirror from Forgejo to Gitlab of a single project"""
+    cfg = load_config()
+    proj_path = project.path_with_namespace
+    url = cfg.forgejo_mirrors_url % proj_path
+    remote_address = f"{cfg.gitlab_url}/{proj_path}"
+    try:
+        existing = {m["remote_address"] for m in _get_forgejo_mirrors(proj_path)}
+    except (requests.RequestException, orjson.JSONDecodeError):
+        existing = set()  # the POST below reports the error
+    if remote_address in existing:
+        fg_print.info(f"Skip {proj_path} (already mirrored)")
+        return
 
-    session = requests.Session()
-    session.auth = (FORGEJO_USER, FORGEJO_PASSWORD)
-    # session.headers.update({"Authorization": FORGEJO_TOKEN})
+    post_data = {**base_post_data, "remote_address": remote_address}
+    try:
+        response: requests.Response = forgejo_session().post(
+            url, json=post_data, timeout=FORGEJO_TIMEOUT
+        )
+    except requests.RequestException as err:
+        fg_print.error(f"Error setting push mirror on Forgejo for {proj_path}: {err}")
+        return
+    if response.ok:
+        fg_print.info(f"Push mirror created on Gitlab for {proj_path}")
+    else:
+        fg_print.error(f"Error setting push mirror on Forgejo for {proj_path}")
 
-    for project in gitlab_projects:
-        proj_path = project.path_with_namespace
-        url = f"{FORGEJO_API_URL}/repos/{proj_path}/push_mirrors"
-        post_data = {
-            "interval": "8h0m0s",
-            "remote_address": f"{GITLAB_URL}/{proj_path}",
-            "remote_password": GITLAB_ADMIN_PASS,
-            "remote_username": GITLAB_ADMIN_USER,
-            "sync_on_commit": True,
-        }
-        response: requests.Response = session.post(url, json=post_data, timeout=10)
-        if response.ok:
-            fg_print.info(f"Push mirror created on Gitlab for {proj_path}")
-        else:
-            fg_print.error(f"Error setting push mirror on Forgejo for {proj_path}")
+
+def to_gitlab(gitlab_projects: Iterable) -> None:
+    """Create push mirrors from Forgejo to Gitlab"""
+    fg_print.info("\nMirroring repositories from Forgejo to Gitlab")
+    cfg = load_config()
+    # the fields shared by every project, only remote_address varies
+    base_post_data = {
+        "interval": "8h0m0s",
+        "remote_password": cfg.gitlab_admin_pass,
+        "remote_username": cfg.gitlab_admin_user,
+        "sync_on_commit": True,
+    }
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        to_gitlab_one = functools.partial(_to_gitlab_one, base_post_data)
+        results = map_bounded(executor, to_gitlab_one, gitlab_projects, SUBMIT_WINDOW)
+        for count, _ in enumerate(results, start=1):
+            if count % FLUSH_EVERY == 0:
+                fg_print.PRINTER.flush()
+    fg_print.PRINTER.flush()
 
 
 if __name__ == "__main__":
     _args = docopt(__doc__)
     args = {k.replace("--", ""): v for k, v in _args.items()}
+    cfg = load_config()
+    fg_print.enable_buffering()
 
-    gl = gitlab.Gitlab(GITLAB_URL, private_token=GITLAB_TOKEN)
+    gl = gitlab.Gitlab(cfg.gitlab_url, private_token=cfg.gitlab_token)
     gl.auth()
     fg_print.info(f"Connected to Gitlab, version: {gl.version()[0]}")
-    limit = args["limit"]
+    limit = int(args["limit"])
 
-    if args["to-forgejo"] or args["to-gitlab"] or args["all"]:
-        if limit != "100000":
-            all_projects = gl.projects.list(all=False, per_page=limit, page=1)
-        else:
-            all_projects = gl.projects.list(all=True)
-        fg_print.info(f"Found {len(all_projects)} projects")
-    else:
+    if not (args["to-forgejo"] or args["to-gitlab"] or args["all"]):
         fg_print.error("Please specify --to-forgejo, --to-gitlab or --all")
         os.sys.exit()
 
+    # the count comes from a one-project page, as Gitlab returns X-Total per listing
+    total = gl.projects.list(iterator=True, per_page=1).total
+    if total is not None:
+        fg_print.info(f"Found {min(total, limit)} projects")
+
+    # every pass streams a fresh listing instead of keeping all projects in memory
     if args["create"]:
         fg_print.info("Creating mirrors")
         if args["to-forgejo"] or args["all"]:
-            to_forgejo(all_projects)
+            to_forgejo(list_projects(gl, limit))
 
         if args["to-gitlab"] or args["all"]:
-            to_gitlab(all_projects)
+            to_gitlab(list_projects(gl, limit))
 
     if args["delete"]:
         fg_print.info("Deleting mirrors")
         if args["to-forgejo"] or args["all"]:
-            delete_to_forgejo(all_projects)
+            delete_to_forgejo(list_projects(gl, limit))
 
         if args["to-gitlab"] or args["all"]:
-            delete_to_gitlab(all_projects)
+            delete_to_gitlab(list_projects(gl, limit))
 
-    ERR_COUNT = fg_print.GLOBAL_ERROR_COUNT
+    ERR_COUNT = fg_print.error_count()
     if ERR_COUNT == 0:
         fg_print.success("\nMigration finished with no errors!")
     else:
@@ -1,7 +1,3 @@
 """migration package"""
 
-import pkgutil
-
-__all__ = []
-for loader, module_name, is_pkg in pkgutil.walk_packages(__path__):
-    __all__.append(module_name)
+__all__ = ["fg_print", "workers"]
@@ -1,6 +1,17 @@
 """print functions"""
 
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+from typing import List
+
 GLOBAL_ERROR_COUNT = 0
+# errors are reported from several worker threads at once, "+= 1" on a global is
+# not atomic, so every update and read goes through this lock
+_ERROR_COUNT_LOCK = threading.Lock()
 
 
 class Bcolors:
@@ -16,37 +27,128 @@ class Bcolors:
     UNDERLINE = "\033[4m"
 
 
+class BufferedPrinter:
+    """Collects console lines and writes them to stdout in batches"""
+
+    def __init__(self):
+        self.buf: List[str] = []
+        self.enabled = False
+        self.listener: logging.handlers.QueueListener = None
+        self._lock = threading.Lock()
+        self._logger = logging.getLogger("fg_migration")
+
+    def write(self, line: str) -> None:
+        """Queues a line, or writes it straight away if buffering is disabled"""
+        if self.listener is not None:
+            self._logger.info(line)
+            return
+        if not self.enabled:
+            sys.stdout.write(line + "\n")
+            return
+        with self._lock:
+            self.buf.append(line)
+
+    def flush(self) -> None:
+        """Writes all queued lines with a single write"""
+        with self._lock:
+            if self.buf:
+                sys.stdout.write("\n".join(self.buf) + "\n")
+                self.buf.clear()
+
+    def start_queue(self) -> None:
+        """Hands lines to a background thread that writes them in order"""
+        if self.listener is not None:
+            return
+        records = queue.SimpleQueue()
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self._logger.addHandler(logging.handlers.QueueHandler(records))
+        self._logger.setLevel(logging.INFO)
+        self._logger.propagate = False
+        self.listener = logging.handlers.QueueListener(records, handler)
+        self.listener.start()
+
+    def stop_queue(self) -> None:
+        """Writes all lines handed to the background thread and stops it"""
+        if self.listener is None:
+            return
+        self.listener.stop()
+        self.listener = None
+        self._logger.handlers.clear()
+
+
+PRINTER = BufferedPrinter()
+atexit.register(PRINTER.flush)
+atexit.register(PRINTER.stop_queue)
+
+
+def enable_buffering() -> None:
+    """Queues all messages until PRINTER.flush() is called"""
+    PRINTER.enabled = True
+    if not sys.stdout.isatty():
+        sys.stdout.reconfigure(line_buffering=False, write_through=False)
+
+
+def enable_queue() -> None:
+    """Writes all messages from a background thread, so workers never wait on stdout"""
+    PRINTER.start_queue()
+
+
+_PREFIX = {
+    "info": Bcolors.OKBLUE,
+    "success": Bcolors.OKGREEN,
+    "warning": Bcolors.WARNING,
+    "error": Bcolors.FAIL,
+}
+
+
+def _emit(level, msg) -> None:
+    """Prints a message in the color of its level"""
+    PRINTER.write(f"{_PREFIX[level]}{msg}{Bcolors.ENDC}")
+
+
 def message(color, msg, colorend=Bcolors.ENDC, bold=False) -> str:
     """Returns a message in color"""
-    if bold:
-        return Bcolors.BOLD + message(color, msg, colorend, False)
-
-    return color + msg + colorend
+    prefix = Bcolors.BOLD if bold else ""
+    return f"{prefix}{color}{msg}{colorend}"
 
 
 def print_color(color, msg, colorend=Bcolors.ENDC, _bold=False) -> None:
     """Prints a message in color"""
-    print(message(color, msg, colorend))
+    PRINTER.write(f"{color}{msg}{colorend}")
+
+
+def log(msg) -> None:
+    """Prints an uncolored message"""
+    PRINTER.write(str(msg))
 
 
 def info(msg) -> None:
     """Prints an info message"""
-    print_color(Bcolors.OKBLUE, msg)
+    _emit("info", msg)
 
 
 def success(msg) -> None:
     """Prints a success message"""
-    print_color(Bcolors.OKGREEN, msg)
+    _emit("success", msg)
 
 
 def warning(msg) -> None:
     """Prints a warning message"""
-    print_color(Bcolors.WARNING, msg)
+    _emit("warning", msg)
 
 
 def error(msg) -> int:
     """Prints an error message and increments the global error count"""
     global GLOBAL_ERROR_COUNT  # pylint: disable=global-statement
-    GLOBAL_ERROR_COUNT += 1
-    print_color(Bcolors.FAIL, msg)
-    return GLOBAL_ERROR_COUNT
+    with _ERROR_COUNT_LOCK:
+        GLOBAL_ERROR_COUNT += 1
+        count = GLOBAL_ERROR_COUNT
+    _emit("error", msg)
+    return count
+
+
+def error_count() -> int:
+    """Returns the number of errors printed so far"""
+    with _ERROR_COUNT_LOCK:
+        return GLOBAL_ERROR_COUNT
@@ -0,0 +1,27 @@
+"""worker pool helpers"""
+
+import collections
+from concurrent.futures import Executor
+from concurrent.futures import Future
+from typing import Callable
+from typing import Deque
+from typing import Iterable
+from typing import Iterator
+
+
+def map_bounded(
+    executor: Executor, fn: Callable, items: Iterable, window: int
+) -> Iterator:
+    """Like executor.map, but submits at most window items ahead of the results
+
+    executor.map submits every item before returning, which drains a lazy
+    listing into memory. Here the next item is only read from items once the
+    oldest pending result has been taken, results come in order.
+    """
+    pending: Deque[Future] = collections.deque()
+    for item in items:
+        if len(pending) >= window:
+            yield pending.popleft().result()
+        pending.append(executor.submit(fn, item))
+    while pending:
+        yield pending.popleft().result()
@@ -18,17 +18,34 @@ Options
   --notify    send notification to users
 """
 import os
-import json
-import re
-import random
+import atexit
+import secrets
 import string
 import configparser
+import functools
+import itertools
+import queue
+import shelve
+import threading
+import time
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
 from typing import Dict
+from typing import Iterable
+from typing import Iterator
 from typing import List
+from typing import NamedTuple
+from typing import Set
+from typing import Tuple
 
 from docopt import docopt
+import httpx
+import orjson
 import requests
-import dateutil.parser
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util import Retry
 
 import gitlab  # pip install python-gitlab
 import gitlab.v4.objects
@@ -54,6 +71,7 @@ from pyforgejo.api.repository import repo_migrate
 from pyforgejo.models.migrate_repo_options import MigrateRepoOptions
 
 from fg_migration import fg_print
+from fg_migration.workers import map_bounded
 
 SCRIPT_VERSION = "0.5"
 
@@ -73,28 +91,189 @@ GITLAB_ADMIN_PASS = config.get("migrate", "gitlab_admin_pass")
 FORGEJO_URL = config.get("migrate", "forgejo_url")
 FORGEJO_API_URL = f"{FORGEJO_URL}/api/v1"
 FORGEJO_TOKEN = config.get("migrate", "forgejo_token")
+# optional file for the GitLab response cache, it holds GitLab api bodies (user
+# emails included) in plain text; empty or unset disables it
+GITLAB_CACHE = config.get("migrate", "gitlab_cache", fallback="")
 #######################
 # CONFIG SECTION END
 #######################
 
+# page size for Forgejo list endpoints (Forgejo's default maximum)
+PAGE_LIMIT = 50
+# number of entities imported concurrently, must not exceed the pool sizes below
+MAX_WORKERS = 8
+# projects read ahead from GitLab while the workers are busy
+PROJECT_QUEUE_SIZE = 20
+# projects whose members are read with a single GitLab GraphQL request
+MEMBERS_BATCH_SIZE = 50
+# remaining GitLab requests in the rate limit window below which calls are spread
+# over the rest of the window
+GITLAB_RATE_LIMIT_RESERVE = 50
+
+# existing Forgejo users, organizations and repositories ("owner/name"), lowercase,
+# listed once per import; None if the list is not (or could not be) loaded
+KNOWN_USERS: Set[str] = None
+KNOWN_ORGS: Set[str] = None
+KNOWN_REPOS: Set[str] = None
+
+# Forgejo ids of users and organizations by lowercase name, filled from the lists
+# above, from created entities and from lookups
+NAMESPACE_ID: Dict[str, int] = {}
+
+# one keep-alive session for the Forgejo calls made with plain requests
+FG_SESSION = requests.Session()
+FG_SESSION.headers.update({"Authorization": FORGEJO_TOKEN})
+FG_SESSION.mount(
+    FORGEJO_URL,
+    HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=32,
+        max_retries=Retry(total=3, backoff_factor=0.3),
+    ),
+)
+
+
+class ETagCacheAdapter(HTTPAdapter):
+    """HTTPAdapter that revalidates GET responses against a cache on disk
+
+    Responses with an ETag are stored per url. The next request for the url sends
+    If-None-Match, and a 304 Not Modified answer is replaced by the stored response,
+    so python-gitlab sees the same body and pagination headers as before.
+    """
+
+    def __init__(self, path: string, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = shelve.open(path)
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def send(self, request: requests.PreparedRequest, *args, **kwargs):
+        if request.method != "GET" or kwargs.get("stream"):
+            return super().send(request, *args, **kwargs)
+
+        with self._lock:
+            closed = self.cache is None
+            cached = None if closed else self.cache.get(request.url)
+        if closed:
+            # requests still sent after close, during exit, go out uncached
+            return super().send(request, *args, **kwargs)
+        if cached:
+            request.headers["If-None-Match"] = cached["etag"]
+        response = super().send(request, *args, **kwargs)
+
+        if cached and response.status_code == 304:
+            # keep the fresh headers, like the rate limit, on top of the stored ones
+            headers = CaseInsensitiveDict(cached["headers"])
+            headers.update(response.headers)
+            response.status_code = 200
+            response.headers = headers
+            response._content = cached["content"]  # pylint: disable=protected-access
+        elif response.status_code == 200 and "ETag" in response.headers:
+            entry = {
+                "etag": response.headers["ETag"],
+                "headers": {
+                    name: value
+                    for name, value in response.headers.items()
+                    if name.lower() != "set-cookie"
+                },
+                "content": response.content,
+            }
+            with self._lock:
+                if self.cache is not None:
+                    self.cache[request.url] = entry
+        return response
+
+    def close(self):
+        super().close()
+        with self._lock:
+            if self.cache is None:
+                return
+            self.cache.close()
+            self.cache = None
+
+
+# the same for python-gitlab, which otherwise keeps requests' default pool of 10
+GL_ADAPTER_ARGS = {
+    "pool_connections": 32,
+    "pool_maxsize": 32,
+    "max_retries": Retry(total=3, backoff_factor=0.3),
+}
+GL_SESSION = requests.Session()
+GL_SESSION.mount(GITLAB_URL, HTTPAdapter(**GL_ADAPTER_ARGS))
+
+
+def _honor_rate_limit(response: requests.Response, *_args, **_kwargs):
+    """slow down the calling worker before GitLab's rate limit is used up
+
+    python-gitlab itself retries on 429 after the Retry-After delay, this only
+    keeps the workers from running into it.
+    """
+    remaining = response.headers.get("RateLimit-Remaining")
+    reset = response.headers.get("RateLimit-Reset")
+    if remaining is None or reset is None:
+        return
+    if int(remaining) >= GITLAB_RATE_LIMIT_RESERVE:
+        return
+
+    window_left = max(0.0, int(reset) - time.time())
+    # every worker waits its share, together they use up the rest of the window
+    time.sleep(min(window_left, window_left * MAX_WORKERS / max(1, int(remaining))))
+
+
+GL_SESSION.hooks["response"].append(_honor_rate_limit)
+
+
+@functools.lru_cache(maxsize=1)
+def get_gitlab() -> gitlab.Gitlab:
+    """get the authenticated GitLab client, created once per process"""
+    if GITLAB_CACHE:
+        # opened here and not at import time, so --help leaves no cache file behind
+        GL_SESSION.mount(GITLAB_URL, ETagCacheAdapter(GITLAB_CACHE, **GL_ADAPTER_ARGS))
+
+    # private token or personal token authentication; keep_base_url keeps following
+    # pagination links on GITLAB_URL if GitLab reports a different external url
+    gl = gitlab.Gitlab(
+        GITLAB_URL,
+        private_token=GITLAB_TOKEN,
+        session=GL_SESSION,
+        per_page=100,
+        keep_base_url=True,
+    )
+    gl.auth()
+    assert isinstance(gl.user, gitlab.v4.objects.CurrentUser)
+    return gl
+
+
+@functools.lru_cache(maxsize=1)
+def get_forgejo() -> AuthenticatedClient:
+    """get the authenticated Forgejo client, created once per process"""
+    # every pyforgejo call goes through the client's single httpx.Client, keep
+    # its pool in line with FG_SESSION
+    return AuthenticatedClient(
+        base_url=FORGEJO_API_URL,
+        token=FORGEJO_TOKEN,
+        timeout=httpx.Timeout(30),
+        httpx_args={
+            "limits": httpx.Limits(max_keepalive_connections=32, max_connections=32)
+        },
+    )
+
 
 def main():
     """Main function"""
     _args = docopt(__doc__)
     args = {k.replace("--", ""): v for k, v in _args.items()}
+    fg_print.enable_queue()
 
     fg_print.print_color(fg_print.Bcolors.HEADER, "---=== Gitlab to Forgejo migration ===---")
-    print(f"Version: {SCRIPT_VERSION}")
-    print()
+    fg_print.log(f"Version: {SCRIPT_VERSION}")
+    fg_print.log("")
 
-    # private token or personal token authentication
-    gl = gitlab.Gitlab(GITLAB_URL, private_token=GITLAB_TOKEN)
-    gl.auth()
-    assert isinstance(gl.user, gitlab.v4.objects.CurrentUser)
+    gl = get_gitlab()
     fg_print.info(f"Connected to Gitlab, version: {gl.version()[0]}")
 
-    fg = AuthenticatedClient(base_url=FORGEJO_API_URL, token=FORGEJO_TOKEN)
-    fg_ver = json.loads(get_version.sync_detailed(client=fg).content)["version"]
+    fg = get_forgejo()
+    fg_ver = orjson.loads(get_version.sync_detailed(client=fg).content)["version"]
     fg_print.info(f"Connected to Forgejo, version: {fg_ver}")
 
     # IMPORT USERS
@@ -113,15 +292,93 @@ def main():
         and not args["projects"]
         and not args["all"]
     ):
-        print()
+        fg_print.log("")
         fg_print.warning("No migration option(s) selected, nothing to do!")
         exit()
 
-    print()
-    if fg_print.GLOBAL_ERROR_COUNT == 0:
+    fg_print.log("")
+    error_count = fg_print.error_count()
+    if error_count == 0:
         fg_print.success("Migration finished with no errors!")
     else:
-        fg_print.error(f"Migration finished with {fg_print.GLOBAL_ERROR_COUNT} errors!")
+        fg_print.error(f"Migration finished with {error_count} errors!")
+
+
+#
+# Data loading helpers for Gitlab
+#
+
+
+class Collaborator(NamedTuple):
+    """direct member of a GitLab project"""
+
+    username: string
+    access_level: int
+
+
+MEMBERS_QUERY = """
+query($ids: [ID!], $first: Int) {
+  projects(ids: $ids, first: $first) {
+    nodes {
+      id
+      projectMembers(relations: [DIRECT], first: 100) {
+        nodes { user { username } accessLevel { integerValue } }
+        pageInfo { hasNextPage }
+      }
+    }
+  }
+}
+"""
+
+
+def _list_project_members(project: gitlab.v4.objects.Project) -> List[Collaborator]:
+    """get the direct members of a project through the REST api"""
+    return [
+        Collaborator(member.username, member.access_level)
+        for member in project.members.list(iterator=True, per_page=100)
+    ]
+
+
+def get_project_members(
+    gitlab_api: gitlab.Gitlab, projects: List[gitlab.v4.objects.Project]
+) -> Dict[int, List[Collaborator]]:
+    """get the direct members of several projects with one GraphQL request
+
+    Projects missing from the answer or with more than 100 members are read
+    through the REST api instead.
+    """
+    members = {}
+    ids = [f"gid://gitlab/Project/{project.id}" for project in projects]
+    try:
+        result = gitlab_api.http_post(
+            f"{GITLAB_URL}/api/graphql",
+            post_data={
+                "query": MEMBERS_QUERY,
+                "variables": {"ids": ids, "first": len(ids)},
+            },
+        )
+        if "errors" in result:
+            fg_print.warning(f"Failed to read project members: {result['errors']}")
+        else:
+            for node in result["data"]["projects"]["nodes"]:
+                node_members = node["projectMembers"]
+                if node_members["pageInfo"]["hasNextPage"]:
+                    continue
+                members[int(node["id"].rsplit("/", 1)[1])] = [
+                    Collaborator(
+                        item["user"]["username"], item["accessLevel"]["integerValue"]
+                    )
+                    for item in node_members["nodes"]
+                    if item["user"] is not None
+                ]
+    except gitlab.exceptions.GitlabError as err:
+        fg_print.warning(f"Failed to read project members: {err}")
+
+    for project in projects:
+        if project.id not in members:
+            members[project.id] = _list_project_members(project)
+
+    return members
 
 
 #
@@ -129,13 +386,75 @@ def main():
 #
 
 
+def get_all_pages(
+    get: Callable, url: string, params: Dict = None, data_key: string = None, **kwargs
+) -> Tuple[requests.Response, List]:
+    """get all pages of a Forgejo list endpoint
+
+    Returns the last response, to check for errors, and the items of all pages
+    loaded until then. data_key names the list for endpoints that wrap it in an
+    object, like the search endpoints.
+    """
+    items = []
+    page = 1
+    while True:
+        response: requests.Response = get(
+            url, params={**(params or {}), "page": page, "limit": PAGE_LIMIT}, **kwargs
+        )
+        if not response.ok:
+            return response, items
+
+        batch = orjson.loads(response.content)
+        if data_key is not None:
+            batch = batch[data_key]
+        items.extend(batch)
+        total = response.headers.get("X-Total-Count")
+        if not batch or (total is not None and len(items) >= int(total)):
+            return response, items
+        page += 1
+
+
+def get_names(
+    url: string, field: string, data_key: string = None, namespaces: bool = False
+) -> Set[str]:
+    """get the lowercase names of all entries of a Forgejo list endpoint
+
+    With namespaces, the ids of the listed users or organizations are also stored
+    in NAMESPACE_ID.
+    """
+    response, items = get_all_pages(FG_SESSION.get, url, data_key=data_key, timeout=10)
+    if not response.ok:
+        fg_print.warning(f"Failed to list {url}, checking one by one! {response.text}")
+        return None
+
+    if namespaces:
+        NAMESPACE_ID.update({item[field].lower(): item["id"] for item in items})
+    return {item[field].lower() for item in items}
+
+
+def _remember(known: Set[str], name: string, created: bytes = None):
+    """add a newly created entry to a list loaded by get_names
+
+    created is the body of the create response of a user or organization, to store
+    its id in NAMESPACE_ID.
+    """
+    if created is not None:
+        NAMESPACE_ID[name.lower()] = orjson.loads(created)["id"]
+    if known is not None:
+        known.add(name.lower())
+
+
+def get_total(objects: gitlab.base.RESTObjectList) -> string:
+    """get the total count of a lazy GitLab list, GitLab omits it for large lists"""
+    return "an unknown number of" if objects.total is None else str(objects.total)
+
+
 def get_labels(fg_api: pyforgejo, owner: string, repo: string) -> List:
     """get labels for a repository"""
-    existing_labels = []
-    label_response: requests.Response = fg_api.get(f"/repos/{owner}/{repo}/labels")
-    if label_response.ok:
-        existing_labels = label_response.json()
-    else:
+    label_response, existing_labels = get_all_pages(
+        fg_api.get, f"/repos/{owner}/{repo}/labels"
+    )
+    if not label_response.ok:
         fg_print.error(
             f"Failed to load existing milestones for project {repo}! {label_response.text}"
         )
@@ -145,13 +464,10 @@ def get_labels(fg_api: pyforgejo, owner: string, repo: string) -> List:
 
 def get_milestones(fg_api: pyforgejo, owner: string, repo: string) -> List:
     """get milestones for a repository"""
-    existing_milestones = []
-    milestone_response: requests.Response = fg_api.get(
-        f"/repos/{owner}/{repo}/milestones"
+    milestone_response, existing_milestones = get_all_pages(
+        fg_api.get, f"/repos/{owner}/{repo}/milestones", {"state": "all"}
     )
-    if milestone_response.ok:
-        existing_milestones = milestone_response.json()
-    else:
+    if not milestone_response.ok:
         fg_print.error(
             f"Failed to load existing milestones for project {repo}! {milestone_response.text}"
         )
@@ -161,13 +477,10 @@ def get_milestones(fg_api: pyforgejo, owner: string, repo: string) -> List:
 
 def get_issues(fg_api: pyforgejo, owner: string, repo: string) -> List:
     """get issues for a repository"""
-    existing_issues = []
-    issue_response: requests.Response = fg_api.get(
-        f"/repos/{owner}/{repo}/issues", params={"state": "all", "page": -1}
+    issue_response, existing_issues = get_all_pages(
+        fg_api.get, f"/repos/{owner}/{repo}/issues", {"state": "all"}
     )
-    if issue_response.ok:
-        existing_issues = issue_response.json()
-    else:
+    if not issue_response.ok:
         fg_print.error(
             f"Failed to load existing issues for project {repo}! {issue_response.text}"
         )
@@ -181,24 +494,19 @@ def get_teams(fg_api: pyforgejo, orgname: string) -> List:
         orgname, client=fg_api
     )
     if team_response.status_code.name == "OK":
-        return json.loads(team_response.content)
+        return orjson.loads(team_response.content)
 
-    msg = json.loads(team_response.content)["errors"]
+    msg = orjson.loads(team_response.content)["errors"]
     fg_print.error(f"Failed to load existing teams for organization {orgname}! {msg}")
     return []
 
 
 def get_team_members(teamid: int) -> List:
     """get members for a team"""
-    existing_members = []
-    member_response: requests.Response = requests.get(
-        f"{FORGEJO_API_URL}/teams/{teamid}/members",
-        headers={"Authorization": FORGEJO_TOKEN},
-        timeout=10,
+    member_response, existing_members = get_all_pages(
+        FG_SESSION.get, f"{FORGEJO_API_URL}/teams/{teamid}/members", timeout=10
     )
-    if member_response.ok:
-        existing_members = member_response.json()
-    else:
+    if not member_response.ok:
         fg_print.error(
             f"Failed to load existing members for team {teamid}! {member_response.text}"
         )
@@ -208,13 +516,10 @@ def get_team_members(teamid: int) -> List:
 
 def get_collaborators(fg_api: pyforgejo, owner: string, repo: string) -> List:
     """get collaborators for a repository"""
-    existing_collaborators = []
-    collaborator_response: requests.Response = fg_api.get(
-        f"/repos/{owner}/{repo}/collaborators"
+    collaborator_response, existing_collaborators = get_all_pages(
+        fg_api.get, f"/repos/{owner}/{repo}/collaborators"
     )
-    if collaborator_response.ok:
-        existing_collaborators = collaborator_response.json()
-    else:
+    if not collaborator_response.ok:
         fg_print.error(
             f"Failed to load existing collaborators for repo {repo}! {collaborator_response.text}"
         )
@@ -227,22 +532,23 @@ def get_user_or_group(project: gitlab.v4.objects.Project) -> Dict:
     result = None
     proj_namespace_path = project.namespace["path"]
     proj_namespace_name = name_clean(project.namespace["name"])
-    session = requests.Session()
-    response: requests.Response = session.get(
-        f"{FORGEJO_API_URL}/users/{proj_namespace_path}",
-        headers={"Authorization": FORGEJO_TOKEN},
-        timeout=10,
+    for known_name in (proj_namespace_path.lower(), proj_namespace_name.lower()):
+        if known_name in NAMESPACE_ID:
+            return {"id": NAMESPACE_ID[known_name]}
+
+    response: requests.Response = FG_SESSION.get(
+        f"{FORGEJO_API_URL}/users/{proj_namespace_path}", timeout=10
     )
     if response.ok:
-        result = response.json()
+        result = orjson.loads(response.content)
+        NAMESPACE_ID[proj_namespace_path.lower()] = result["id"]
     else:
-        response: requests.Response = session.get(
-            f"{FORGEJO_API_URL}/orgs/{proj_namespace_name}",
-            headers={"Authorization": FORGEJO_TOKEN},
-            timeout=10,
+        response: requests.Response = FG_SESSION.get(
+            f"{FORGEJO_API_URL}/orgs/{proj_namespace_name}", timeout=10
         )
         if response.ok:
-            result = response.json()
+            result = orjson.loads(response.content)
+            NAMESPACE_ID[proj_namespace_name.lower()] = result["id"]
         else:
             fg_print.error(
                 f"Failed to load user or group {proj_namespace_name}! {response.text}"
@@ -257,7 +563,7 @@ def get_user_keys(fg_api: pyforgejo, username: string) -> Dict:
         username, client=fg_api
     )
     if key_response.status_code.name == "OK":
-        return json.loads(key_response.content)
+        return orjson.loads(key_response.content)
 
     status_code = key_response.status_code.name
     fg_print.error(f"Failed to load user keys for user {username}! {status_code}")
@@ -266,63 +572,31 @@ def get_user_keys(fg_api: pyforgejo, username: string) -> Dict:
 
 def user_exists(fg_api: pyforgejo, username: string) -> bool:
     """check if a user exists"""
-    user_response: requests.Response = user_get.sync_detailed(username, client=fg_api)
-    if user_response.status_code.name == "OK":
+    if KNOWN_USERS is not None:
+        exists = username.lower() in KNOWN_USERS
+    else:
+        user_response = user_get.sync_detailed(username, client=fg_api)
+        exists = user_response.status_code.name == "OK"
+    if exists:
         fg_print.warning(f"User {username} already exists in Forgejo, skipping!")
         return True
 
-    print(f"User {username} not found in Forgejo, importing!")
-    return False
-
-
-def user_key_exists(fg_api: pyforgejo, username: string, keyname: string) -> bool:
-    """check if a public key exists for a user"""
-    existing_keys = get_user_keys(fg_api, username)
-    if existing_keys:
-        existing_key = next(
-            (item for item in existing_keys if item["title"] == keyname), None
-        )
-
-        if existing_key is not None:
-            fg_print.warning(
-                f"Public key {keyname} already exists for user {username}, skipping!"
-            )
-            return True
-
-        print(f"Public key {keyname} does not exist for user {username}, importing!")
-        return False
-
-    print(f"No public keys for user {username}, importing!")
+    fg_print.log(f"User {username} not found in Forgejo, importing!")
     return False
 
 
 def organization_exists(fg_api: pyforgejo, orgname: string) -> bool:
     """check if an organization exists"""
-    group_response: requests.Response = org_get.sync_detailed(orgname, client=fg_api)
-    if group_response.status_code.name == "OK":
+    if KNOWN_ORGS is not None:
+        exists = orgname.lower() in KNOWN_ORGS
+    else:
+        group_response = org_get.sync_detailed(orgname, client=fg_api)
+        exists = group_response.status_code.name == "OK"
+    if exists:
         fg_print.warning(f"Group {orgname} already exists in Forgejo, skipping!")
         return True
 
-    print(f"Group {orgname} not found in Forgejo, importing!")
-    return False
-
-
-def member_exists(username: string, teamid: int) -> bool:
-    """check if a member exists in a team"""
-    existing_members = get_team_members(teamid)
-    if existing_members:
-        existing_member = next(
-            (item for item in existing_members if item["username"] == username), None
-        )
-
-        if existing_member:
-            fg_print.warning(f"Member {username} is already in team {teamid}, skipping!")
-            return True
-
-        print(f"Member {username} is not in team {teamid}, importing!")
-        return False
-
-    print(f"No members in team {teamid}, importing!")
+    fg_print.log(f"Group {orgname} not found in Forgejo, importing!")
     return False
 
 
@@ -336,86 +610,23 @@ def collaborator_exists(
     if collaborator_response.ok:
         fg_print.warning(f"Collaborator {username} already exists in Forgejo, skipping!")
     else:
-        print(f"Collaborator {username} not found in Forgejo, importing!")
+        fg_print.log(f"Collaborator {username} not found in Forgejo, importing!")
 
     return collaborator_response.ok
 
 
 def repo_exists(fg_api: pyforgejo, owner: string, repo: string) -> bool:
     """check if a repository exists"""
-    repo_response: requests.Response = repo_get.sync_detailed(
-        owner=owner, repo=repo, client=fg_api
-    )
-    if repo_response.status_code.name == "OK":
+    if KNOWN_REPOS is not None:
+        exists = f"{owner}/{repo}".lower() in KNOWN_REPOS
+    else:
+        repo_response = repo_get.sync_detailed(owner=owner, repo=repo, client=fg_api)
+        exists = repo_response.status_code.name == "OK"
+    if exists:
         fg_print.warning(f"Project {repo} already exists in Forgejo, skipping!")
         return True
 
-    print(f"Project {repo} not found in Forgejo, importing!")
-    return False
-
-
-def label_exists(
-    fg_api: pyforgejo, owner: string, repo: string, labelname: string
-) -> bool:
-    """check if a label exists in a repository"""
-    existing_labels = get_labels(fg_api, owner, repo)
-    if existing_labels:
-        existing_label = next(
-            (item for item in existing_labels if item["name"] == labelname), None
-        )
-
-        if existing_label is not None:
-            fg_print.warning(
-                f"Label {labelname} already exists in project {repo}, skipping!"
-            )
-            return True
-
-        print(f"Label {labelname} does not exist in project {repo}, importing!")
-        return False
-
-    print(f"No labels in project {repo}, importing!")
-    return False
-
-
-def milestone_exists(
-    fg_api: pyforgejo, owner: string, repo: string, milestone: string
-) -> bool:
-    """check if a milestone exists in a repository"""
-    existing_milestones = get_milestones(fg_api, owner, repo)
-    if existing_milestones:
-        existing_milestone = next(
-            (item for item in existing_milestones if item["title"] == milestone), None
-        )
-
-        if existing_milestone is not None:
-            fg_print.warning(
-                f"Milestone {milestone} already exists in project {repo}, skipping!"
-            )
-            return True
-
-        print(f"Milestone {milestone} does not exist in project {repo}, importing!")
-        return False
-
-    print(f"No milestones in project {repo}, importing!")
-    return False
-
-
-def issue_exists(fg_api: pyforgejo, owner: string, repo: string, issue: string) -> bool:
-    """check if an issue exists in a repository"""
-    existing_issues = get_issues(fg_api, owner, repo)
-    if existing_issues:
-        existing_issue = next(
-            (item for item in existing_issues if item["title"] == issue), None
-        )
-
-        if existing_issue is not None:
-            fg_print.warning(f"Issue {issue} already exists in project {repo}, skipping!")
-            return True
-
-        print(f"Issue {issue} does not exist in project {repo}, importing!")
-        return False
-
-    print(f"No issues in project {repo}, importing!")
+    fg_print.log(f"Project {repo} not found in Forgejo, importing!")
     return False
 
 
@@ -431,20 +642,33 @@ def _import_project_labels(
     repo: string,
 ):
     """import labels for a repository"""
-    for label in labels:
-        if not label_exists(fg_api, owner, repo, label.name):
-            import_response: requests.Response = fg_api.post(
-                f"/repos/{owner}/{repo}/labels",
-                json={
-                    "name": label.name,
-                    "color": label.color,
-                    "description": label.description,  # currently not supported
-                },
+    existing_labels = {item["name"]: item for item in get_labels(fg_api, owner, repo)}
+
+    def _import_label(label):
+        """import a single label"""
+        if label.name in existing_labels:
+            fg_print.warning(
+                f"Label {label.name} already exists in project {repo}, skipping!"
             )
-            if import_response.ok:
-                fg_print.info(f"Label {label.name} imported!")
-            else:
-                fg_print.error(f"Label {label.name} import failed: {import_response.text}")
+            return
+
+        fg_print.log(f"Label {label.name} does not exist in project {repo}, importing!")
+        import_response: requests.Response = fg_api.post(
+            f"/repos/{owner}/{repo}/labels",
+            json={
+                "name": label.name,
+                "color": label.color,
+                "description": label.description,  # currently not supported
+            },
+        )
+        if import_response.ok:
+            fg_print.info(f"Label {label.name} imported!")
+            existing_labels[label.name] = orjson.loads(import_response.content)
+        else:
+            fg_print.error(f"Label {label.name} import failed: {import_response.text}")
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        list(executor.map(_import_label, labels))
 
 
 def _import_project_milestones(
@@ -454,48 +678,62 @@ def _import_project_milestones(
     repo: string,
 ):
     """import milestones for a repository"""
-    for milestone in milestones:
-        if not milestone_exists(fg_api, owner, repo, milestone.title):
-            due_date = None
-            if milestone.due_date is not None and milestone.due_date != "":
-                due_date = dateutil.parser.parse(milestone.due_date).strftime(
-                    "%Y-%m-%dT%H:%M:%SZ"
-                )
+    existing_milestones = {
+        item["title"]: item for item in get_milestones(fg_api, owner, repo)
+    }
 
-            import_response: requests.Response = fg_api.post(
-                f"/repos/{owner}/{repo}/milestones",
-                json={
-                    "description": milestone.description,
-                    "due_on": due_date,
-                    "title": milestone.title,
-                },
+    def _import_milestone(milestone):
+        """import a single milestone"""
+        if milestone.title in existing_milestones:
+            fg_print.warning(
+                f"Milestone {milestone.title} already exists in project {repo}, skipping!"
             )
-            if import_response.ok:
-                fg_print.info(f"Milestone {milestone.title} imported!")
-                existing_milestone = import_response.json()
-
-                if existing_milestone:
-                    # update milestone state, this cannot be done in the initial import :(
-                    # ? TODO: Forgejo api ignores the closed state...
-                    update_response: requests.Response = fg_api.patch(
-                        f"/repos/{owner}/{repo}/milestones/{existing_milestone['id']}",
-                        json={
-                            "description": milestone.description,
-                            "due_on": due_date,
-                            "title": milestone.title,
-                            "state": milestone.state,
-                        },
-                    )
-                    if update_response.ok:
-                        fg_print.info(f"Milestone {milestone.title} updated!")
-                    else:
-                        fg_print.error(
-                            f"Milestone {milestone.title} update failed: {update_response.text}"
-                        )
-            else:
-                fg_print.error(
-                    f"Milestone {milestone.title} import failed: {import_response.text}"
+            return
+
+        fg_print.log(
+            f"Milestone {milestone.title} does not exist in project {repo}, importing!"
+        )
+        due_date = None
+        if milestone.due_date is not None and milestone.due_date != "":
+            due_date = date.fromisoformat(milestone.due_date).strftime(
+                "%Y-%m-%dT%H:%M:%SZ"
+            )
+
+        import_response: requests.Response = fg_api.post(
+            f"/repos/{owner}/{repo}/milestones",
+            json={
+                "description": milestone.description,
+                "due_on": due_date,
+                "title": milestone.title,
+            },
+        )
+        if import_response.ok:
+            fg_print.info(f"Milestone {milestone.title} imported!")
+            existing_milestone = orjson.loads(import_response.content)
+            existing_milestones[milestone.title] = existing_milestone
+
+            # GitLab calls open milestones "active", Forgejo calls them "open"
+            state = "closed" if milestone.state == "closed" else "open"
+            if existing_milestone and existing_milestone.get("state") != state:
+                # update milestone state, this cannot be done in the initial import :(
+                # ? TODO: Forgejo api ignores the closed state...
+                update_response: requests.Response = fg_api.patch(
+                    f"/repos/{owner}/{repo}/milestones/{existing_milestone['id']}",
+                    json={"state": state},
                 )
+                if update_response.ok:
+                    fg_print.info(f"Milestone {milestone.title} updated!")
+                else:
+                    fg_print.error(
+                        f"Milestone {milestone.title} update failed: {update_response.text}"
+                    )
+        else:
+            fg_print.error(
+                f"Milestone {milestone.title} import failed: {import_response.text}"
+            )
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        list(executor.map(_import_milestone, milestones))
 
 
 def _import_project_issues(
@@ -505,69 +743,66 @@ def _import_project_issues(
     repo: string,
 ):
     # reload all existing milestones and labels, needed for assignment in issues
-    existing_milestones = get_milestones(fg_api, owner, repo)
-    existing_labels = get_labels(fg_api, owner, repo)
+    milestone_ids = {
+        item["title"]: item["id"] for item in get_milestones(fg_api, owner, repo)
+    }
+    label_ids = {item["name"]: item["id"] for item in get_labels(fg_api, owner, repo)}
+    existing_issues = {item["title"] for item in get_issues(fg_api, owner, repo)}
 
     for issue in issues:
-        if not issue_exists(fg_api, owner, repo, issue.title):
-            due_date = ""
-            if issue.due_date is not None:
-                due_date = dateutil.parser.parse(issue.due_date).strftime(
-                    "%Y-%m-%dT%H:%M:%SZ"
-                )
-
-            assignee = None
-            if issue.assignee is not None:
-                assignee = issue.assignee["username"]
-
-            assignees = []
-            for tmp_assignee in issue.assignees:
-                assignees.append(tmp_assignee["username"])
-
-            milestone = None
-            if issue.milestone is not None:
-                existing_milestone = next(
-                    (
-                        item
-                        for item in existing_milestones
-                        if item["title"] == issue.milestone["title"]
-                    ),
-                    None,
-                )
-                if existing_milestone:
-                    milestone = existing_milestone["id"]
+        if issue.title in existing_issues:
+            fg_print.warning(
+                f"Issue {issue.title} already exists in project {repo}, skipping!"
+            )
+            continue
 
-            labels = []
-            for label in issue.labels:
-                existing_label = next(
-                    (item for item in existing_labels if item["name"] == label), None
-                )
-                if existing_label:
-                    labels.append(existing_label["id"])
-
-            import_response: requests.Response = fg_api.post(
-                f"/repos/{owner}/{repo}/issues",
-                json={
-                    "assignee": assignee,
-                    "assignees": assignees,
-                    "body": issue.description,
-                    "closed": issue.state == "closed",
-                    "due_on": due_date,
-                    "labels": labels,
-                    "milestone": milestone,
-                    "title": issue.title,
-                },
+        fg_print.log(
+            f"Issue {issue.title} does not exist in project {repo}, importing!"
+        )
+        due_date = ""
+        if issue.due_date is not None:
+            due_date = date.fromisoformat(issue.due_date).strftime(
+                "%Y-%m-%dT%H:%M:%SZ"
             )
-            if import_response.ok:
-                fg_print.info(f"Issue {issue.title} imported!")
-            else:
-                fg_print.error(
-                    f"Issue {issue.title} import failed: {import_response.text}"
-                )
+
+        assignee = None
+        if issue.assignee is not None:
+            assignee = issue.assignee["username"]
+
+        assignees = []
+        for tmp_assignee in issue.assignees:
+            assignees.append(tmp_assignee["username"])
+
+        milestone = None
+        if issue.milestone is not None:
+            milestone = milestone_ids.get(issue.milestone["title"])
+
+        labels = [label_ids[label] for label in issue.labels if label in label_ids]
+
+        import_response: requests.Response = fg_api.post(
+            f"/repos/{owner}/{repo}/issues",
+            json={
+                "assignee": assignee,
+                "assignees": assignees,
+                "body": issue.description,
+                "closed": issue.state == "closed",
+                "due_on": due_date,
+                "labels": labels,
+                "milestone": milestone,
+                "title": issue.title,
+            },
+        )
+        if import_response.ok:
+            fg_print.info(f"Issue {issue.title} imported!")
+            existing_issues.add(issue.title)
+        else:
+            fg_print.error(f"Issue {issue.title} import failed: {import_response.text}")
 
 
 def _import_project_repo(fg_api: pyforgejo, project: gitlab.v4.objects.Project):
-    if not repo_exists(fg_api, project.namespace["name"], name_clean(project.name)):
+    owner_name = project.namespace["name"]
+    repo_name = name_clean(project.name)
+    if not repo_exists(fg_api, owner_name, repo_name):
         clone_url = project.http_url_to_repo
         if GITLAB_ADMIN_PASS == "" and GITLAB_ADMIN_USER == "":
             clone_url = project.ssh_url_to_repo
@@ -583,34 +818,32 @@ def _import_project_repo(fg_api: pyforgejo, project: gitlab.v4.objects.Project):
                     description=project.description,
                     mirror=False,
                     private=private,
-                    repo_name=name_clean(project.name),
+                    repo_name=repo_name,
                     uid=owner["id"],
                 ),
                 client=fg_api,
             )
             if import_response.status_code.name == "CREATED":
-                fg_print.info(f"Project {name_clean(project.name)} imported!")
+                _remember(KNOWN_REPOS, f"{owner_name}/{repo_name}")
+                fg_print.info(f"Project {repo_name} imported!")
             else:
-                err_message = json.loads(import_response.content)["message"]
-                fg_print.error(
-                    f"Project {name_clean(project.name)} "
-                    + f"import failed: {err_message}"
-                )
+                err_message = orjson.loads(import_response.content)["message"]
+                fg_print.error(f"Project {repo_name} import failed: {err_message}")
         else:
-            fg_print.error(
-                f"Failed to load project owner for project {name_clean(project.name)}"
-            )
+            fg_print.error(f"Failed to load project owner for project {repo_name}")
 
 
 def _import_project_repo_collaborators(
     fg_api: pyforgejo,
-    collaborators: List[gitlab.v4.objects.ProjectMember],
+    collaborators: List[Collaborator],
     project: gitlab.v4.objects.Project,
 ):
     """import collaborators for a repository"""
-    for collaborator in collaborators:
-        proj_name = project.namespace["name"]
-        clean_proj_name = name_clean(project.name)
+    proj_name = project.namespace["name"]
+    clean_proj_name = name_clean(project.name)
+
+    def _import_collaborator(collaborator):
+        """import a single collaborator"""
         if not collaborator_exists(
             fg_api, proj_name, clean_proj_name, collaborator.username
         ):
@@ -625,15 +858,13 @@ def _import_project_repo_collaborators(
                 permission = "admin"
             elif collaborator.access_level == 50:  # owner access (only for groups)
                 fg_print.error("Groupmembers are currently not supported!")
-                continue  # groups are not supported
+                return  # groups are not supported
             else:
                 fg_print.warning(
                     f"Unsupported access level {collaborator.access_level}, "
                     + "setting permissions to 'read'!"
                 )
 
-            proj_name = project.namespace["name"]
-            clean_proj_name = name_clean(project.name)
             import_response: requests.Response = fg_api.put(
                 f"/repos/{proj_name}/{clean_proj_name}/collaborators/{collaborator.username}",
                 json={"permission": permission},
@@ -645,14 +876,16 @@ def _import_project_repo_collaborators(
                     f"Collaborator {collaborator.username} import failed: {import_response.text}"
                 )
 
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        list(executor.map(_import_collaborator, collaborators))
+
 
 def _import_users(
-    fg_api: pyforgejo, users: List[gitlab.v4.objects.User], notify: bool = False
+    fg_api: pyforgejo, users: Iterable[gitlab.v4.objects.User], notify: bool = False
 ):
     """import users and their public keys"""
     if not user_exists(fg_api, "redirect"):
-        rnd_str = "".join(random.choices(string.ascii_uppercase + string.digits, k=10))
-        tmp_password = f"Tmp1!{rnd_str}"
+        tmp_password = f"Tmp1!{secrets.token_urlsafe(8)}"
         # Some gitlab instances do not publish user emails, so we use a dummy email
         body = CreateUserOption(
             email="redirect@noemail-git.local",
@@ -667,22 +900,26 @@ def _import_users(
             body=body, client=fg_api
         )
         if import_response.status_code.name == "CREATED":
+            _remember(KNOWN_USERS, "redirect")
             fg_print.info(f"User redirect imported, temporary password: {tmp_password}")
         else:
-            msg = json.loads(import_response.content)["message"]
+            msg = orjson.loads(import_response.content)["message"]
             fg_print.error(f"User redirect import failed: {msg}")
 
-    for user in users:
-        keys: List[gitlab.v4.objects.UserKey] = user.keys.list(all=True)
+    def _import_user(user):
+        """import a single user and its public keys"""
+        keys: List[gitlab.v4.objects.UserKey] = list(
+            user.keys.list(iterator=True, per_page=100)
+        )
 
-        print(f"Importing user {user.username}...")
-        print(f"Found {len(keys)} public keys for user {user.username}")
+        # one write, so the two lines stay together while other workers print
+        fg_print.log(
+            f"Importing user {user.username}...\n"
+            f"Found {len(keys)} public keys for user {user.username}"
+        )
 
         if not user_exists(fg_api, user.username):
-            rnd_str = "".join(
-                random.choices(string.ascii_uppercase + string.digits, k=10)
-            )
-            tmp_password = f"Tmp1!{rnd_str}"
+            tmp_password = f"Tmp1!{secrets.token_urlsafe(8)}"
             # Some gitlab instances do not publish user emails, so we use a dummy email
             tmp_email = f"{user.username}@noemail-git.local"
             try:
@@ -702,15 +939,21 @@ def _import_users(
                 body=body, client=fg_api
             )
             if import_response.status_code.name == "CREATED":
+                _remember(KNOWN_USERS, user.username, import_response.content)
                 fg_print.info(
                     f"User {user.username} imported, temporary password: {tmp_password}"
                 )
             else:
-                msg = json.loads(import_response.content)["message"]
+                msg = orjson.loads(import_response.content)["message"]
                 fg_print.error(f"User {user.username} import failed: {msg}")
 
         # import public keys
-        _import_user_keys(fg_api, keys, user)
+        if keys:
+            _import_user_keys(fg_api, keys, user)
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        # bounded, so the lazy GitLab listing is read as the imports progress
+        list(map_bounded(executor, _import_user, users, 2 * MAX_WORKERS))
 
 
 def _import_user_keys(
@@ -719,34 +962,49 @@ def _import_user_keys(
     user: gitlab.v4.objects.User,
 ):
     """import public keys for a user"""
+    existing_keys = {item["title"] for item in get_user_keys(fg_api, user.username)}
     for key in keys:
-        if not user_key_exists(fg_api, user.username, key.title):
-            import_response: requests.Response = admin_create_public_key.sync_detailed(
-                username=user.username,
-                body=CreateKeyOption(
-                    key=key.key,
-                    read_only=True,
-                    title=key.title,
-                ),
-                client=fg_api,
+        if key.title in existing_keys:
+            fg_print.warning(
+                f"Public key {key.title} already exists for user {user.username}, skipping!"
             )
-            if import_response.status_code.name == "CREATED":
-                fg_print.info(f"Public key {key.title} imported!")
-            else:
-                msg = json.loads(import_response.content)["message"]
-                fg_print.error(f"Public key {key.title} import failed: {msg}")
+            continue
+
+        fg_print.log(
+            f"Public key {key.title} does not exist for user {user.username}, importing!"
+        )
+        import_response: requests.Response = admin_create_public_key.sync_detailed(
+            username=user.username,
+            body=CreateKeyOption(
+                key=key.key,
+                read_only=True,
+                title=key.title,
+            ),
+            client=fg_api,
+        )
+        if import_response.status_code.name == "CREATED":
+            fg_print.info(f"Public key {key.title} imported!")
+            existing_keys.add(key.title)
+        else:
+            msg = orjson.loads(import_response.content)["message"]
+            fg_print.error(f"Public key {key.title} import failed: {msg}")
 
 
-def _import_groups(fg_api: pyforgejo, groups: List[gitlab.v4.objects.Group]):
+def _import_groups(fg_api: pyforgejo, groups: Iterable[gitlab.v4.objects.Group]):
     """import groups and their members"""
-    print(f"Found {len(groups)} gitlab groups")
-    print(f"Importing groups... {groups}")
-    for group in groups:
-        members: List[gitlab.v4.objects.GroupMember] = group.members.list(all=True)
+    fg_print.log("Importing groups...")
+
+    def _import_group(group):
+        """import a single group and its members"""
+        members: List[gitlab.v4.objects.GroupMember] = list(
+            group.members.list(iterator=True, per_page=100)
+        )
 
         clean_group_name = name_clean(group.name)
-        print(f"Importing group {clean_group_name}...")
-        print(f"Found {len(members)} gitlab members for group {name_clean(group.name)}")
+        fg_print.log(
+            f"Importing group {clean_group_name}...\n"
+            f"Found {len(members)} gitlab members for group {clean_group_name}"
+        )
 
         if not organization_exists(fg_api, name_clean(group.name)):
             import_response: requests.Response = org_create.sync_detailed(
@@ -760,13 +1018,18 @@ def _import_groups(fg_api: pyforgejo, groups: List[gitlab.v4.objects.Group]):
                 client=fg_api,
             )
             if import_response.status_code.name == "CREATED":
+                _remember(KNOWN_ORGS, name_clean(group.name), import_response.content)
                 fg_print.info(f"Group {name_clean(group.name)} imported!")
             else:
-                msg = json.loads(import_response.content)["message"]
+                msg = orjson.loads(import_response.content)["message"]
                 fg_print.error(f"Group {name_clean(group.name)} import failed: {msg}")
         # import group members
         _import_group_members(fg_api, members, group)
 
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        # bounded, so the lazy GitLab listing is read as the imports progress
+        list(map_bounded(executor, _import_group, groups, 2 * MAX_WORKERS))
+
 
 def _import_group_members(
     fg_api: pyforgejo,
@@ -779,25 +1042,35 @@ def _import_group_members(
     if existing_teams:
         first_team = existing_teams[0]
         first_team_name = first_team["name"]
-        print(
+        fg_print.log(
             f"Organization teams fetched, importing users to first team: {first_team_name}"
         )
+        team_id = first_team["id"]
+        existing_members = {item["username"] for item in get_team_members(team_id)}
         for member in members:
-            if not member_exists(member.username, first_team["id"]):
-                import_response: requests.Response = requests.put(
-                    f"{FORGEJO_API_URL}/users/{member.username}",
-                    headers={"Authorization": FORGEJO_TOKEN},
-                    timeout=10,
-                    data={"username": member.username},
+            if member.username in existing_members:
+                fg_print.warning(
+                    f"Member {member.username} is already in team {team_id}, skipping!"
+                )
+                continue
+
+            fg_print.log(
+                f"Member {member.username} is not in team {team_id}, importing!"
+            )
+            import_response: requests.Response = FG_SESSION.put(
+                f"{FORGEJO_API_URL}/users/{member.username}",
+                timeout=10,
+                data={"username": member.username},
+            )
+            if import_response.ok:
+                fg_print.info(
+                    f"Member {member.username} added to group {name_clean(group.name)}!"
+                )
+                existing_members.add(member.username)
+            else:
+                fg_print.error(
+                    f"Failed to add member {member.username} to group {name_clean(group.name)}!"
                 )
-                if import_response.ok:
-                    fg_print.info(
-                        f"Member {member.username} added to group {name_clean(group.name)}!"
-                    )
-                else:
-                    fg_print.error(
-                        f"Failed to add member {member.username} to group {name_clean(group.name)}!"
-                    )
     else:
         fg_print.error(
             f"Failed to import members to group {name_clean(group.name)}: no teams found!"
@@ -811,10 +1084,19 @@ def _import_group_members(
 
 def import_users(gitlab_api: gitlab.Gitlab, fg_api: pyforgejo, notify=False):
     """import all users and groups"""
+    global KNOWN_USERS  # pylint: disable=global-statement
+    KNOWN_USERS = get_names(
+        f"{FORGEJO_API_URL}/admin/users", "login", namespaces=True
+    )
+
     # read all users
-    users: List[gitlab.v4.objects.User] = gitlab_api.users.list(all=True)
+    users: gitlab.base.RESTObjectList = gitlab_api.users.list(
+        iterator=True, per_page=100
+    )
 
-    print(f"Found {len(users)} gitlab users as user {gitlab_api.user.username}")
+    fg_print.log(
+        f"Found {get_total(users)} gitlab users as user {gitlab_api.user.username}"
+    )
 
     # import all non existing users
     _import_users(fg_api, users, notify)
@@ -822,10 +1104,19 @@ def import_users(gitlab_api: gitlab.Gitlab, fg_api: pyforgejo, notify=False):
 
 def import_groups(gitlab_api: gitlab.Gitlab, fg_api: pyforgejo):
     """import all users and groups"""
+    global KNOWN_ORGS  # pylint: disable=global-statement
+    KNOWN_ORGS = get_names(
+        f"{FORGEJO_API_URL}/admin/orgs", "username", namespaces=True
+    )
+
     # read all users
-    groups: List[gitlab.v4.objects.Group] = gitlab_api.groups.list(all=True)
+    groups: gitlab.base.RESTObjectList = gitlab_api.groups.list(
+        iterator=True, per_page=100
+    )
 
-    print(f"Found {len(groups)} gitlab groups as user {gitlab_api.user.username}")
+    fg_print.log(
+        f"Found {get_total(groups)} gitlab groups as user {gitlab_api.user.username}"
+    )
 
     # import all non existing groups
     _import_groups(fg_api, groups)
@@ -833,14 +1124,18 @@ def import_groups(gitlab_api: gitlab.Gitlab, fg_api: pyforgejo):
 
 def import_projects(gitlab_api: gitlab.Gitlab, fg_api: pyforgejo):
     """read all projects and their issues"""
-    projects: gitlab.v4.objects.Project = gitlab_api.projects.list(all=True)
+    global KNOWN_REPOS  # pylint: disable=global-statement
+    KNOWN_REPOS = get_names(f"{FORGEJO_API_URL}/repos/search", "full_name", "data")
 
-    print(f"Found {len(projects)} gitlab projects as user {gitlab_api.user.username}")
+    # keyset pagination pages by id cursor, GitLab skips counting all projects
+    projects: Iterator[gitlab.v4.objects.Project] = gitlab_api.projects.list(
+        iterator=True, pagination="keyset", order_by="id", sort="asc", per_page=100
+    )
 
-    for project in projects:
-        collaborators: List[gitlab.v4.objects.ProjectMember] = project.members.list(
-            all=True
-        )
+    fg_print.log(f"Reading gitlab projects as user {gitlab_api.user.username}...")
+
+    def _import_project(project, collaborators: List[Collaborator]):
+        """import a single project and its collaborators"""
         # labels: List[gitlab.v4.objects.ProjectLabel] = project.labels.list(all=True)
         # milestones: List[gitlab.v4.objects.ProjectMilestone] = project.milestones.list(
         #     all=True
@@ -849,8 +1144,10 @@ def import_projects(gitlab_api: gitlab.Gitlab, fg_api: pyforgejo):
 
         proj_name = project.namespace["name"]
         clean_proj_name = name_clean(project.name)
-        print(f"Importing project {clean_proj_name} from owner {proj_name}")
-        print(f"Found {len(collaborators)} collaborators for project {clean_proj_name}")
+        fg_print.log(
+            f"Importing project {clean_proj_name} from owner {proj_name}\n"
+            f"Found {len(collaborators)} collaborators for project {clean_proj_name}"
+        )
         # print(f"Found {len(labels)} labels for project {clean_proj_name}")
         # print(f"Found {len(milestones)} milestones for project {clean_proj_name}")
         # print(f"Found {len(issues)} issues for project {clean_proj_name}")
@@ -876,11 +1173,53 @@ def import_projects(gitlab_api: gitlab.Gitlab, fg_api: pyforgejo):
         #    fg_api, issues, project.namespace["name"], name_clean(project.name)
         # )
 
+    # the GitLab pages are read here while the workers import, the bounded queue
+    # keeps the listing at most PROJECT_QUEUE_SIZE projects ahead
+    pending: queue.Queue = queue.Queue(maxsize=PROJECT_QUEUE_SIZE)
 
+    def _worker():
+        """import projects from the queue until it hands out None"""
+        while (item := pending.get()) is not None:
+            project, collaborators = item
+            try:
+                _import_project(project, collaborators)
+            except Exception as err:  # pylint: disable=broad-except
+                fg_print.error(f"Project {project.name} import failed: {err}")
+
+    workers = [threading.Thread(target=_worker) for _ in range(MAX_WORKERS)]
+    for worker in workers:
+        worker.start()
+
+    project_count = 0
+    try:
+        while batch := list(itertools.islice(projects, MEMBERS_BATCH_SIZE)):
+            members = get_project_members(gitlab_api, batch)
+            for project in batch:
+                pending.put((project, members[project.id]))
+            project_count += len(batch)
+    finally:
+        for _ in workers:
+            pending.put(None)
+        for worker in workers:
+            worker.join()
+
+    fg_print.log(f"Processed {project_count} gitlab projects")
+
+
+# byte table for name_clean: letters, digits, "_", "." and "-" are kept, spaces
+# become "_" and everything else "-"
+_NAME_ALLOWED = (string.ascii_letters + string.digits + "_.-").encode("ascii")
+_NAME_TABLE = bytes(
+    c if c in _NAME_ALLOWED else ord("_") if c == ord(" ") else ord("-")
+    for c in range(256)
+)
+
+
+@functools.lru_cache(maxsize=4096)
 def name_clean(name):
     """Cleans a name for usage in Forgejo"""
-    new_name = name.replace(" ", "_")
-    new_name = re.sub(r"[^a-zA-Z0-9_\.-]", "-", new_name)
+    # non-ASCII characters are encoded as a single "?" each, which maps to "-"
+    new_name = name.encode("ascii", "replace").translate(_NAME_TABLE).decode("ascii")
 
     if new_name.lower() == "plugins":
         return f"{new_name}-user"